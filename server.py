@@ -1,15 +1,26 @@
-from typing import Any, List, Dict, Optional, Union
+from typing import Any, AsyncIterator, Awaitable, Callable, Final, List, Dict, Optional, Tuple, Union
+from contextlib import asynccontextmanager, suppress
 import httpx
-import json
+from cachetools import TTLCache
+from dotenv import load_dotenv
 from mcp.server.fastmcp import FastMCP
 import random
 import asyncio
+import functools
+import inspect
+import itertools
+import logging
 import os
 
+# orjson decodes the large exercise payloads much faster; fall back to the stdlib if it is missing
+try:
+    from orjson import loads as json_loads
+except ImportError:
+    from json import loads as json_loads
+
 load_dotenv()
 
-# Create a FastMCP server instance
-mcp = FastMCP("exercisedb")
+log = logging.getLogger("exercisedb")
 
 # ExerciseDB API configuration
 EXERCISEDB_API_HOST = "exercisedb.p.rapidapi.com"
@@ -25,36 +36,398 @@ HEADERS = {
     "Accept": "application/json"
 }
 
-# Cache for API responses to improve performance
-_cache = {}
+# Cache for API responses to improve performance (bounded, entries expire after an hour)
+CACHE_MAX_ENTRIES = 512
+CACHE_TTL_SECONDS = 3600
+_cache: TTLCache = TTLCache(maxsize=CACHE_MAX_ENTRIES, ttl=CACHE_TTL_SECONDS)
+_pending_requests: Dict[Any, asyncio.Future] = {}
+
+# Cap concurrent outbound requests and retry rate-limited ones with exponential back-off
+MAX_CONCURRENT_REQUESTS = 20
+MAX_REQUEST_ATTEMPTS = 3
+MAX_RETRY_DELAY_SECONDS = 30
+RETRY_STATUS_CODES = (429, 503)
+_rate_limit = asyncio.Semaphore(MAX_CONCURRENT_REQUESTS)
+
+# Cache for rendered responses of tools whose output depends only on their arguments
+TOOL_CACHE_MAX_ENTRIES = 128
+TOOL_CACHE_TTL_SECONDS = 1800
+_tool_cache: TTLCache = TTLCache(maxsize=TOOL_CACHE_MAX_ENTRIES, ttl=TOOL_CACHE_TTL_SECONDS)
+
+# Equipment values that mean "don't filter by equipment"
+_ANY_EQUIPMENT = frozenset(("any", "all"))
+
+# Shared HTTP client so tool calls reuse pooled keep-alive connections
+_client: Optional[httpx.AsyncClient] = None
+
+def _get_http_client() -> httpx.AsyncClient:
+    """Return the shared ExerciseDB HTTP client, creating it on first use"""
+    global _client
+    if _client is None or _client.is_closed:
+        _client = httpx.AsyncClient(
+            base_url=API_BASE_URL,
+            headers=HEADERS,
+            http2=True,
+            timeout=30.0,
+            limits=httpx.Limits(max_connections=100, max_keepalive_connections=20)
+        )
+    return _client
+
+# Body parts known to ExerciseDB; their exercise lists are effectively static,
+# so they are prefetched at startup and refreshed periodically. Entries also
+# expire after the refresh interval, for callers that never run the server lifespan
+KNOWN_BODY_PARTS = ["back", "cardio", "chest", "lower arms", "lower legs", "neck", "shoulders", "upper arms", "upper legs", "waist"]
+BODY_PART_REFRESH_SECONDS = 3600
+_bodypart_cache: TTLCache = TTLCache(maxsize=len(KNOWN_BODY_PARTS) * 2, ttl=BODY_PART_REFRESH_SECONDS)
+
+@asynccontextmanager
+async def _server_lifespan(server: FastMCP) -> AsyncIterator[Dict[str, Any]]:
+    """Keep the body part cache warm and close the shared HTTP client on shutdown"""
+    refresh_task = asyncio.create_task(_keep_body_parts_warm())
+    try:
+        yield {}
+    finally:
+        # Let an in-flight warmup finish cancelling before its client is closed
+        refresh_task.cancel()
+        with suppress(asyncio.CancelledError):
+            await refresh_task
+        if _client is not None:
+            await _client.aclose()
+
+# Create a FastMCP server instance
+mcp = FastMCP("exercisedb", lifespan=_server_lifespan)
 
 async def make_api_request(endpoint: str, params: Optional[Dict[str, Any]] = None, use_cache: bool = True) -> Union[Dict[str, Any], List[Dict[str, Any]], None]:
     """Make a request to the ExerciseDB API with caching support"""
-    cache_key = f"{endpoint}_{json.dumps(params or {}, sort_keys=True)}"
-    
-    if use_cache and cache_key in _cache:
-        return _cache[cache_key]
-    
-    url = f"{API_BASE_URL}{endpoint}"
+    if not use_cache:
+        return await fetch_from_api(endpoint, params)
+    
+    # Most calls pass no params, so the bare endpoint is enough as a key
+    cache_key = endpoint if not params else (endpoint, *sorted(params.items()))
+    cached = _cache.get(cache_key)
+    if cached is not None:
+        return cached
+    
+    # Concurrent misses for the same key share one request instead of each hitting the API
+    pending = _pending_requests.get(cache_key)
+    if pending is None:
+        pending = asyncio.ensure_future(fetch_from_api(endpoint, params))
+        _pending_requests[cache_key] = pending
+        
+        def store_result(task: asyncio.Future) -> None:
+            _pending_requests.pop(cache_key, None)
+            if not task.cancelled() and task.result() is not None:
+                _cache[cache_key] = task.result()
+        
+        pending.add_done_callback(store_result)
     
-    async with httpx.AsyncClient() as client:
+    return await asyncio.shield(pending)
+
+async def fetch_from_api(endpoint: str, params: Optional[Dict[str, Any]] = None) -> Union[Dict[str, Any], List[Dict[str, Any]], None]:
+    """Request an ExerciseDB endpoint, retrying rate-limited responses; returns None on failure"""
+    for attempt in range(MAX_REQUEST_ATTEMPTS):
         try:
-            response = await client.get(url, headers=HEADERS, params=params or {}, timeout=30.0)
+            async with _rate_limit:
+                response = await _get_http_client().get(endpoint, params=params or {})
             response.raise_for_status()
-            data = response.json()
-            
-            if use_cache:
-                _cache[cache_key] = data
-            
+            data = json_loads(response.content)
+            add_lowercase_fields(data)
             return data
         except httpx.HTTPStatusError as e:
-            print(f"HTTP error occurred: {e.response.status_code}")
+            if e.response.status_code in RETRY_STATUS_CODES and attempt < MAX_REQUEST_ATTEMPTS - 1:
+                await asyncio.sleep(get_retry_delay(e.response, attempt))
+                continue
+            log.warning("HTTP error %s on %s", e.response.status_code, endpoint)
             if e.response.status_code == 401:
-                print("Authentication failed. Please check your RapidAPI key.")
+                log.warning("Authentication failed. Please check your RapidAPI key.")
             return None
-        except Exception as e:
-            print(f"An error occurred: {e}")
+        except Exception:
+            log.exception("Request to %s failed", endpoint)
             return None
+    return None
+
+def get_retry_delay(response: httpx.Response, attempt: int) -> float:
+    """Seconds to wait before retrying a rate-limited request, honoring Retry-After when present"""
+    try:
+        delay = float(response.headers.get("Retry-After", 2 ** attempt))
+    except ValueError:
+        delay = 2 ** attempt
+    if not delay >= 0:  # negative or NaN
+        delay = 2 ** attempt
+    return min(delay, MAX_RETRY_DELAY_SECONDS)
+
+def add_lowercase_fields(data: Union[Dict[str, Any], List[Any], None]) -> None:
+    """Attach lowercased copies of the filterable fields (e.g. _equipment_lc) to fetched exercise records"""
+    records = data if isinstance(data, list) else [data]
+    for exercise in records:
+        if isinstance(exercise, dict):
+            exercise['_name_lc'] = exercise.get('name', '').lower()
+            exercise['_target_lc'] = exercise.get('target', '').lower()
+            exercise['_bodyPart_lc'] = exercise.get('bodyPart', '').lower()
+            exercise['_equipment_lc'] = exercise.get('equipment', '').lower()
+
+async def warmup() -> None:
+    """Prefetch the exercises for every known body part into the body part cache"""
+    results = await asyncio.gather(*(
+        make_api_request(f"/exercises/bodyPart/{body_part}", use_cache=False) for body_part in KNOWN_BODY_PARTS
+    ))
+    for body_part, data in zip(KNOWN_BODY_PARTS, results):
+        if data:
+            _bodypart_cache[body_part] = data
+
+async def _keep_body_parts_warm() -> None:
+    """Run warmup at startup and then once every refresh interval"""
+    while True:
+        await warmup()
+        await asyncio.sleep(BODY_PART_REFRESH_SECONDS)
+
+# Lowercased name index over the full exercise list, rebuilt whenever that list is refetched
+_name_index: List[Tuple[str, Dict[str, Any]]] = []
+_name_index_source: Optional[List[Dict[str, Any]]] = None
+
+async def get_exercise_name_index() -> List[Tuple[str, Dict[str, Any]]]:
+    """Return (lowercased name, exercise) pairs for every exercise in the database"""
+    global _name_index, _name_index_source
+    data = await make_api_request("/exercises")
+    if data is not _name_index_source:
+        _name_index = [(exercise['_name_lc'], exercise) for exercise in data or []]
+        _name_index_source = data
+    return _name_index
+
+async def fetch_body_part(body_part: str) -> Optional[List[Dict[str, Any]]]:
+    """Get exercises for a body part from the prefetched cache, fetching and caching them on a miss"""
+    data = _bodypart_cache.get(body_part)
+    if data is None:
+        data = await make_api_request(f"/exercises/bodyPart/{body_part}")
+        if data:
+            _bodypart_cache[body_part] = data
+    return data
+
+async def fetch_body_parts(body_parts: List[str]) -> List[Optional[List[Dict[str, Any]]]]:
+    """Get exercises for several body parts, fetching any that are not cached concurrently"""
+    cached = [_bodypart_cache.get(body_part) for body_part in body_parts]
+    if None not in cached:
+        return cached
+    return await asyncio.gather(*(fetch_body_part(body_part) for body_part in body_parts))
+
+def filter_by_equipment(exercises: List[Dict[str, Any]], equipment_lc: str, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+    """Take up to limit exercises using the given (lowercased) equipment, stopping once enough match"""
+    if equipment_lc in _ANY_EQUIPMENT:
+        return exercises[:limit]
+    return list(itertools.islice((ex for ex in exercises if equipment_lc in ex['_equipment_lc']), limit))
+
+@functools.lru_cache(maxsize=256)
+def _title(value: str) -> str:
+    """Title-case a database value; there are only a few dozen distinct body parts, targets and equipment"""
+    return value.title()
+
+def dedupe_by_id(exercises: List[Dict[str, Any]], limit: Optional[int] = None) -> List[Dict[str, Any]]:
+    """Drop exercises with repeated IDs (keeping the first one) and cap the result at limit"""
+    unique: Dict[Any, Dict[str, Any]] = {}
+    for exercise in exercises:
+        unique.setdefault(exercise.get('id'), exercise)
+    return list(unique.values())[:limit]
+
+# Template for one entry in format_exercise_list
+_EXERCISE_TMPL: Final[str] = """**{i}. {name}**
+- **ID:** {id}
+- **Body Part:** {body_part}
+- **Target Muscle:** {target}
+- **Equipment:** {equipment}
+- **Instructions:** {instructions}{gif_section}"""
+
+# Header templates for get_workout_by_difficulty and create_hiit_workout
+_WORKOUT_HEADER_TMPL: Final[str] = """
+# 🎯 {difficulty_title} {focus_title} Workout
+
+**📊 Difficulty Level:** {difficulty_title}
+**🎯 Focus Area:** {focus_title}
+**🛠️ Equipment:** {equipment_title}
+**⏱️ Duration:** ~{duration} minutes
+**💪 Exercises:** {exercise_count}
+
+## 📋 {difficulty_title} Guidelines
+- **Sets/Reps:** {sets_info}
+- **Rest Between Sets:** {rest_info}
+- **Intensity:** {intensity_note}
+
+## 💪 Workout Exercises
+
+"""
+
+_HIIT_HEADER_TMPL: Final[str] = """
+# 🔥 HIIT Workout - {intensity_title} Intensity
+
+**⚡ Intensity Level:** {intensity_title}
+**🛠️ Equipment:** {equipment_title}
+**🔄 Rounds:** {rounds}
+**💪 Exercises:** {exercise_count}
+**⏰ Work Time:** {work_time} seconds
+**😴 Rest Time:** {rest_time} seconds
+**⏱️ Total Time:** ~{total_minutes} minutes
+
+## 🎯 HIIT Structure
+
+Perform each exercise for {work_time} seconds, rest for {rest_time} seconds, then move to the next exercise. Complete all exercises for one round, then repeat for {rounds} total rounds.
+
+"""
+
+# Static guidance appended to the end of the generated workout plans
+_WORKOUT_PLAN_FOOTER: Final[str] = """
+## 💡 Workout Guidelines:
+- **Warm-up:** 5-10 minutes of light cardio and dynamic stretching
+- **Form Focus:** Quality over quantity - maintain proper form throughout
+- **Progressive Overload:** Gradually increase intensity as you get stronger
+- **Rest Periods:** Allow adequate rest between exercises and sets
+- **Cool-down:** 5-10 minutes of stretching and breathing exercises
+- **Hydration:** Keep water nearby and stay hydrated
+- **Listen to Your Body:** Stop if you feel pain or excessive fatigue
+
+## 🎬 Visual Guides:
+All exercises include animated GIF demonstrations to help you maintain proper form and technique.
+"""
+
+_CIRCUIT_FOOTER: Final[str] = """
+## 💡 Circuit Training Tips:
+- **Warm-up:** 5-10 minutes of light movement and dynamic stretching
+- **Intensity:** Maintain high intensity during work periods
+- **Form Priority:** Never sacrifice form for speed
+- **Modifications:** Adjust work/rest ratios based on fitness level
+- **Hydration:** Stay hydrated throughout the circuit
+- **Cool-down:** 5-10 minutes of stretching and breathing exercises
+
+## 🎬 Visual Demonstrations:
+Each exercise includes an animated GIF to help you maintain perfect form and maximize results.
+"""
+
+_BEGINNER_FOOTER: Final[str] = """
+## 🗓️ Sample Weekly Schedule
+
+**Monday:** Full routine
+**Tuesday:** Rest or light walking
+**Wednesday:** Full routine
+**Thursday:** Rest or light stretching
+**Friday:** Full routine
+**Saturday:** Rest or light activity
+**Sunday:** Rest
+
+## 🌟 Beginner Success Tips
+
+1. **Start Slow:** Master the movement before adding intensity
+2. **Listen to Your Body:** Some muscle soreness is normal, sharp pain is not
+3. **Consistency Over Intensity:** Regular moderate workouts beat sporadic intense ones
+4. **Use the GIFs:** Study the visual demonstrations before each exercise
+5. **Progress Gradually:** Add weight/reps only when current level feels easy
+6. **Rest is Important:** Allow 48 hours between training the same muscle groups
+7. **Stay Hydrated:** Drink water before, during, and after workouts
+8. **Track Progress:** Keep a simple log of sets, reps, and how you feel
+
+## 🎬 Visual Learning
+Each exercise includes an animated GIF demonstration. Study these carefully to:
+- Learn proper form and technique
+- Understand the full range of motion
+- See the exercise pace and rhythm
+- Identify common mistakes to avoid
+"""
+
+_DIFFICULTY_FOOTER: Final[str] = """
+
+## 🎬 Visual Form Guides
+Every exercise includes an animated demonstration to help you:
+- Master proper technique at your skill level
+- Understand the optimal range of motion
+- Maintain consistent form throughout your sets
+- Progress safely to more advanced variations
+"""
+
+_HIIT_FOOTER: Final[str] = """
+
+## 💡 HIIT Success Tips
+- **Warm-up:** 5-10 minutes of light cardio and dynamic stretching
+- **Form First:** Never sacrifice form for speed, even in HIIT
+- **Use the GIFs:** Study proper technique before starting
+- **Listen to Your Body:** Adjust intensity based on how you feel
+- **Stay Hydrated:** Keep water nearby throughout the workout
+- **Cool-down:** 5-10 minutes of walking and stretching
+
+## 🎬 Visual Technique Guides
+Each exercise includes animated demonstrations to help you maintain proper form even at high intensity.
+"""
+
+_MODIFICATION_FOOTER: Final[str] = """
+## 💡 Modification Tips
+- **Progression:** Start with easier versions and gradually work up
+- **Listen to Your Body:** Choose modifications based on your current ability
+- **Form Priority:** Perfect easier versions before attempting harder ones
+- **Use GIFs:** Study the demonstrations to understand proper technique
+- **Consistency:** Regular practice with appropriate modifications beats sporadic advanced attempts
+"""
+
+# Failure responses of the filter-list tools
+_ERR_BODY_PARTS: Final[str] = "❌ Unable to fetch body parts list."
+_ERR_TARGETS: Final[str] = "❌ Unable to fetch target muscles list."
+_ERR_EQUIPMENT: Final[str] = "❌ Unable to fetch equipment list."
+_ERR_FILTER_LISTS: Final[str] = "❌ Unable to fetch filter lists."
+
+# Exercise count, sets/reps, rest and intensity note for get_workout_by_difficulty, by difficulty level
+_DIFFICULTY_PROFILE: Final[Dict[str, Tuple[int, str, str, str]]] = {
+    "beginner": (5, "2-3 sets of 8-12 reps", "90-120 seconds", "Focus on learning proper form. Start with bodyweight or light weights."),
+    "intermediate": (7, "3-4 sets of 10-15 reps", "60-90 seconds", "Moderate intensity. Challenge yourself while maintaining good form."),
+    "advanced": (9, "4-5 sets of 12-20 reps", "45-75 seconds", "High intensity. Push your limits with perfect form and controlled movements."),
+}
+
+# Tips section for get_workout_by_difficulty, by difficulty level
+_DIFFICULTY_TIPS: Final[Dict[str, str]] = {
+    "beginner": """
+## 🌟 Beginner Tips
+- Study the GIF demonstrations before starting each exercise
+- Start with lighter weights or easier variations
+- Focus on learning the movement pattern first
+- Don't rush - quality over quantity
+- It's okay to take longer rest periods initially
+""",
+    "intermediate": """
+## 🔥 Intermediate Progression
+- Use the GIFs to refine your technique
+- Gradually increase weight when you can complete all sets easily
+- Focus on mind-muscle connection
+- Consider adding drop sets or supersets for extra challenge
+- Track your progress to ensure continuous improvement
+""",
+    "advanced": """
+## ⚡ Advanced Techniques
+- Use the GIFs to perfect your form even at high intensities
+- Implement advanced techniques like rest-pause, drop sets, or tempo work
+- Focus on progressive overload and periodization
+- Consider adding plyometric or explosive movements
+- Push intensity while never compromising form
+""",
+}
+
+# Guidelines section for create_hiit_workout, by intensity level
+_INTENSITY_GUIDE: Final[Dict[str, str]] = {
+    "low": """
+## 🌱 Low Intensity Guidelines
+- Work at 60-70% of maximum effort
+- Focus on maintaining good form throughout
+- This is great for beginners or recovery days
+- You should be able to maintain a conversation during rest periods
+""",
+    "moderate": """
+## 🔥 Moderate Intensity Guidelines
+- Work at 70-85% of maximum effort
+- Push yourself but maintain control
+- You should feel challenged but not completely exhausted
+- Brief conversations possible during rest periods
+""",
+    "high": """
+## ⚡ High Intensity Guidelines
+- Work at 85-95% of maximum effort
+- Give everything you have during work periods
+- You should feel significantly challenged
+- Focus on recovery during rest periods - minimal talking
+""",
+}
 
 def format_exercise_list(exercises: List[Dict[str, Any]], limit: int = 10, show_gif: bool = True) -> str:
     """Format a list of exercises for display with GIF URLs"""
@@ -66,19 +439,26 @@ def format_exercise_list(exercises: List[Dict[str, Any]], limit: int = 10, show_
     
     formatted_exercises = []
     for i, exercise in enumerate(display_exercises, 1):
-        gif_section = ""
-        if show_gif and exercise.get('gifUrl'):
-            gif_section = f"\n- **Visual Guide (GIF):** {exercise.get('gifUrl')}"
+        gif_url = exercise.get('gifUrl')
+        gif_section = f"\n- **Visual Guide (GIF):** {gif_url}" if show_gif and gif_url else ""
         
-        formatted = f"""
-**{i}. {exercise.get('name', 'Unknown Exercise')}**
-- **ID:** {exercise.get('id', 'N/A')}
-- **Body Part:** {exercise.get('bodyPart', 'N/A').title()}
-- **Target Muscle:** {exercise.get('target', 'N/A').title()}
-- **Equipment:** {exercise.get('equipment', 'N/A').title()}
-- **Instructions:** {exercise.get('instructions', ['No instructions available'])[0][:100] + '...' if exercise.get('instructions') and len(exercise.get('instructions')[0]) > 100 else exercise.get('instructions', ['No instructions available'])[0] if exercise.get('instructions') else 'No instructions available'}{gif_section}
-"""
-        formatted_exercises.append(formatted.strip())
+        instructions = exercise.get('instructions')
+        if instructions:
+            first_instruction = instructions[0]
+            instruction_text = first_instruction[:100] + '...' if len(first_instruction) > 100 else first_instruction
+        else:
+            instruction_text = 'No instructions available'
+        
+        formatted_exercises.append(_EXERCISE_TMPL.format_map({
+            "i": i,
+            "name": exercise.get('name', 'Unknown Exercise'),
+            "id": exercise.get('id', 'N/A'),
+            "body_part": _title(exercise.get('bodyPart', 'N/A')),
+            "target": _title(exercise.get('target', 'N/A')),
+            "equipment": _title(exercise.get('equipment', 'N/A')),
+            "instructions": instruction_text,
+            "gif_section": gif_section,
+        }).rstrip())
     
     result = "\n\n".join(formatted_exercises)
     
@@ -93,10 +473,15 @@ def format_exercise_detail(exercise: Dict[str, Any]) -> str:
         return "Exercise not found."
     
     instructions = exercise.get('instructions', [])
-    instructions_text = "\n".join([f"{i+1}. {instruction}" for i, instruction in enumerate(instructions)])
+    instructions_text = "\n".join([f"{i}. {instruction}" for i, instruction in enumerate(instructions, 1)])
     
     secondary_muscles = exercise.get('secondaryMuscles', [])
-    secondary_text = ", ".join([muscle.title() for muscle in secondary_muscles]) if secondary_muscles else "None"
+    if not secondary_muscles:
+        secondary_text = "None"
+    elif len(secondary_muscles) == 1:
+        secondary_text = _title(secondary_muscles[0])
+    else:
+        secondary_text = ", ".join([_title(muscle) for muscle in secondary_muscles])
     
     gif_section = ""
     if exercise.get('gifUrl'):
@@ -107,10 +492,10 @@ def format_exercise_detail(exercise: Dict[str, Any]) -> str:
 
 **📋 Basic Information:**
 - **ID:** {exercise.get('id', 'N/A')}
-- **Body Part:** {exercise.get('bodyPart', 'N/A').title()}
-- **Primary Target:** {exercise.get('target', 'N/A').title()}
+- **Body Part:** {_title(exercise.get('bodyPart', 'N/A'))}
+- **Primary Target:** {_title(exercise.get('target', 'N/A'))}
 - **Secondary Muscles:** {secondary_text}
-- **Equipment:** {exercise.get('equipment', 'N/A').title()}
+- **Equipment:** {_title(exercise.get('equipment', 'N/A'))}
 
 **📝 Step-by-Step Instructions:**
 {instructions_text or 'No detailed instructions available'}
@@ -126,7 +511,7 @@ def format_workout_plan(exercises: List[Dict[str, Any]], workout_type: str, equi
     if not exercises:
         return "No exercises found for this workout plan."
     
-    workout_plan = f"""
+    parts = [f"""
 # 🏋️ {workout_type.title()} Workout Plan
 
 **⏱️ Duration:** ~{duration} minutes
@@ -135,16 +520,16 @@ def format_workout_plan(exercises: List[Dict[str, Any]], workout_type: str, equi
 
 ## 🎯 Workout Structure
 
-"""
+"""]
     
     for i, exercise in enumerate(exercises, 1):
         instructions = exercise.get('instructions', [])
         main_instruction = instructions[0] if instructions else "Follow proper form and controlled movement"
         
         # Calculate suggested sets/reps based on exercise type
-        if "cardio" in exercise.get('bodyPart', '').lower():
+        if "cardio" in exercise['_bodyPart_lc']:
             sets_reps = "3 sets of 30-45 seconds"
-        elif "abs" in exercise.get('target', '').lower() or "core" in exercise.get('target', '').lower():
+        elif "abs" in exercise['_target_lc'] or "core" in exercise['_target_lc']:
             sets_reps = "3 sets of 12-20 reps"
         else:
             sets_reps = "3 sets of 8-12 reps"
@@ -153,44 +538,59 @@ def format_workout_plan(exercises: List[Dict[str, Any]], workout_type: str, equi
         if exercise.get('gifUrl'):
             gif_section = f"\n- **🎬 Exercise Demo:** {exercise.get('gifUrl')}"
         
-        workout_plan += f"""
+        parts.append(f"""
 ### Exercise {i}: {exercise.get('name', 'Unknown Exercise')}
-- **🎯 Target:** {exercise.get('target', 'N/A').title()}
-- **🛠️ Equipment:** {exercise.get('equipment', 'N/A').title()}
+- **🎯 Target:** {_title(exercise.get('target', 'N/A'))}
+- **🛠️ Equipment:** {_title(exercise.get('equipment', 'N/A'))}
 - **📝 Key Instruction:** {main_instruction}
 - **📊 Sets/Reps:** {sets_reps}
 - **⏰ Rest:** 60-90 seconds between sets{gif_section}
 
-"""
+""")
     
-    workout_plan += """
-## 💡 Workout Guidelines:
-- **Warm-up:** 5-10 minutes of light cardio and dynamic stretching
-- **Form Focus:** Quality over quantity - maintain proper form throughout
-- **Progressive Overload:** Gradually increase intensity as you get stronger
-- **Rest Periods:** Allow adequate rest between exercises and sets
-- **Cool-down:** 5-10 minutes of stretching and breathing exercises
-- **Hydration:** Keep water nearby and stay hydrated
-- **Listen to Your Body:** Stop if you feel pain or excessive fatigue
+    parts.append(_WORKOUT_PLAN_FOOTER)
+    
+    return "".join(parts)
 
-## 🎬 Visual Guides:
-All exercises include animated GIF demonstrations to help you maintain proper form and technique.
-"""
+def memoize_tool(func: Callable[..., Awaitable[str]]) -> Callable[..., Awaitable[str]]:
+    """Cache a deterministic tool's response by its arguments; error responses are not cached"""
+    signature = inspect.signature(func)
     
-    return workout_plan
+    @functools.wraps(func)
+    async def wrapper(*args: Any, **kwargs: Any) -> str:
+        bound = signature.bind(*args, **kwargs)
+        bound.apply_defaults()
+        key = (func.__name__, *bound.arguments.values())
+        cached = _tool_cache.get(key)
+        if cached is not None:
+            return cached
+        
+        result = await func(*args, **kwargs)
+        if not result.startswith("❌"):
+            _tool_cache[key] = result
+        return result
+    
+    return wrapper
 
 @mcp.tool()
 async def get_all_exercises(limit: int = 20) -> str:
     """Get a comprehensive list of all exercises in the database with GIF demonstrations. Use limit to control results (max 50 recommended)."""
     endpoint = "/exercises"
-    data = await make_api_request(endpoint)
+    data = _cache.get(endpoint)
+    
+    if data:
+        return f"**📚 Exercise Database (Showing {min(limit, len(data))} of {len(data)} exercises):**\n\n" + format_exercise_list(data, limit)
+    
+    # The full list is not cached yet, so only page in the exercises that will be shown
+    data = await make_api_request(endpoint, params={"limit": limit, "offset": 0})
     
     if not data:
         return "❌ Unable to fetch exercises data. Please check your API connection."
     
-    return f"**📚 Exercise Database (Showing {min(limit, len(data))} of {len(data)} exercises):**\n\n" + format_exercise_list(data, limit)
+    return f"**📚 Exercise Database (Showing first {min(limit, len(data))} exercises):**\n\n" + format_exercise_list(data, limit)
 
 @mcp.tool()
+@memoize_tool
 async def get_exercise_by_id(exercise_id: str) -> str:
     """Get detailed information about a specific exercise by its ID, including full instructions and GIF demonstration."""
     endpoint = f"/exercises/exercise/{exercise_id}"
@@ -202,12 +602,12 @@ async def get_exercise_by_id(exercise_id: str) -> str:
     return format_exercise_detail(data)
 
 @mcp.tool()
+@memoize_tool
 async def get_exercises_by_body_part(body_part: str, limit: int = 15) -> str:
     """Get exercises targeting a specific body part with GIF demonstrations. 
     
     Available body parts: back, cardio, chest, lower arms, lower legs, neck, shoulders, upper arms, upper legs, waist"""
-    endpoint = f"/exercises/bodyPart/{body_part.lower()}"
-    data = await make_api_request(endpoint)
+    data = await fetch_body_part(body_part.lower())
     
     if not data:
         return f"❌ Unable to fetch exercises for body part: {body_part}. Please check the body part name."
@@ -215,6 +615,7 @@ async def get_exercises_by_body_part(body_part: str, limit: int = 15) -> str:
     return f"**🎯 {body_part.title()} Exercises (Showing {min(limit, len(data))} of {len(data)} exercises):**\n\n" + format_exercise_list(data, limit)
 
 @mcp.tool()
+@memoize_tool
 async def get_exercises_by_target_muscle(target_muscle: str, limit: int = 15) -> str:
     """Get exercises targeting a specific muscle with GIF demonstrations.
     
@@ -228,6 +629,7 @@ async def get_exercises_by_target_muscle(target_muscle: str, limit: int = 15) ->
     return f"**🎯 {target_muscle.title()} Targeted Exercises (Showing {min(limit, len(data))} of {len(data)} exercises):**\n\n" + format_exercise_list(data, limit)
 
 @mcp.tool()
+@memoize_tool
 async def get_exercises_by_equipment(equipment: str, limit: int = 15) -> str:
     """Get exercises using specific equipment with GIF demonstrations.
     
@@ -258,6 +660,8 @@ async def create_personalized_workout(
         focus_areas: "strength", "endurance", "muscle building", "fat loss", "balanced"
     """
     
+    eq = equipment.lower()
+    
     # Determine exercise count based on duration and fitness level
     if duration_minutes <= 20:
         exercise_count = 4
@@ -276,26 +680,20 @@ async def create_personalized_workout(
     
     # Handle different workout types
     if "chest" in workout_type.lower():
-        chest_data = await make_api_request(f"/exercises/bodyPart/chest")
+        chest_data = await fetch_body_part("chest")
         if chest_data:
-            if equipment.lower() not in ["any", "all"]:
-                chest_data = [ex for ex in chest_data if equipment.lower() in ex.get('equipment', '').lower()]
-            exercises.extend(chest_data[:exercise_count])
+            exercises.extend(filter_by_equipment(chest_data, eq, exercise_count))
     
     elif "full body" in workout_type.lower() or "full-body" in workout_type.lower():
         body_parts = ["chest", "back", "upper legs", "shoulders", "upper arms", "waist"]
         exercises_per_part = max(1, exercise_count // len(body_parts))
         
-        for body_part in body_parts:
-            part_data = await make_api_request(f"/exercises/bodyPart/{body_part}")
+        for part_data in await fetch_body_parts(body_parts):
             if part_data:
-                if equipment.lower() not in ["any", "all"]:
-                    part_data = [ex for ex in part_data if equipment.lower() in ex.get('equipment', '').lower()]
-                exercises.extend(part_data[:exercises_per_part])
+                exercises.extend(filter_by_equipment(part_data, eq, exercises_per_part))
     
     elif "leg" in workout_type.lower() or "lower body" in workout_type.lower():
-        upper_legs = await make_api_request(f"/exercises/bodyPart/upper legs")
-        lower_legs = await make_api_request(f"/exercises/bodyPart/lower legs")
+        upper_legs, lower_legs = await fetch_body_parts(["upper legs", "lower legs"])
         
         combined_data = []
         if upper_legs:
@@ -304,51 +702,35 @@ async def create_personalized_workout(
             combined_data.extend(lower_legs)
         
         if combined_data:
-            if equipment.lower() not in ["any", "all"]:
-                combined_data = [ex for ex in combined_data if equipment.lower() in ex.get('equipment', '').lower()]
-            exercises.extend(combined_data[:exercise_count])
+            exercises.extend(filter_by_equipment(combined_data, eq, exercise_count))
     
     elif "upper body" in workout_type.lower():
         upper_parts = ["chest", "back", "shoulders", "upper arms"]
         exercises_per_part = max(1, exercise_count // len(upper_parts))
         
-        for body_part in upper_parts:
-            part_data = await make_api_request(f"/exercises/bodyPart/{body_part}")
+        for part_data in await fetch_body_parts(upper_parts):
             if part_data:
-                if equipment.lower() not in ["any", "all"]:
-                    part_data = [ex for ex in part_data if equipment.lower() in ex.get('equipment', '').lower()]
-                exercises.extend(part_data[:exercises_per_part])
+                exercises.extend(filter_by_equipment(part_data, eq, exercises_per_part))
     
     elif "cardio" in workout_type.lower() or "hiit" in workout_type.lower():
-        cardio_data = await make_api_request(f"/exercises/bodyPart/cardio")
+        cardio_data = await fetch_body_part("cardio")
         if cardio_data:
-            if equipment.lower() not in ["any", "all"]:
-                cardio_data = [ex for ex in cardio_data if equipment.lower() in ex.get('equipment', '').lower()]
-            exercises.extend(cardio_data[:exercise_count])
+            exercises.extend(filter_by_equipment(cardio_data, eq, exercise_count))
     
     else:
         # Try to match with body parts
-        body_part_data = await make_api_request(f"/exercises/bodyPart/{workout_type.lower()}")
+        body_part_data = await fetch_body_part(workout_type.lower())
         if body_part_data:
-            if equipment.lower() not in ["any", "all"]:
-                body_part_data = [ex for ex in body_part_data if equipment.lower() in ex.get('equipment', '').lower()]
-            exercises.extend(body_part_data[:exercise_count])
+            exercises.extend(filter_by_equipment(body_part_data, eq, exercise_count))
     
     # If no exercises found, try equipment-based search
-    if not exercises and equipment.lower() not in ["any", "all"]:
-        equipment_data = await make_api_request(f"/exercises/equipment/{equipment.lower().replace(' ', '%20')}")
+    if not exercises and eq not in _ANY_EQUIPMENT:
+        equipment_data = await make_api_request(f"/exercises/equipment/{eq.replace(' ', '%20')}")
         if equipment_data:
             exercises.extend(equipment_data[:exercise_count])
     
     # Remove duplicates and limit to desired count
-    seen_ids = set()
-    unique_exercises = []
-    for exercise in exercises:
-        if exercise.get('id') not in seen_ids:
-            seen_ids.add(exercise.get('id'))
-            unique_exercises.append(exercise)
-            if len(unique_exercises) >= exercise_count:
-                break
+    unique_exercises = dedupe_by_id(exercises, exercise_count)
     
     if not unique_exercises:
         return f"❌ Unable to create workout plan for '{workout_type}' with '{equipment}' equipment. Try different parameters."
@@ -375,71 +757,53 @@ async def create_circuit_training(
         rest_time: Rest duration in seconds
     """
     
+    eq = equipment.lower()
+    
     exercises = []
     
     if "full body" in target_areas.lower():
         body_parts = ["chest", "back", "upper legs", "shoulders", "upper arms", "waist"]
         exercises_per_part = max(1, exercises_per_round // len(body_parts))
         
-        for body_part in body_parts:
-            part_data = await make_api_request(f"/exercises/bodyPart/{body_part}")
+        for part_data in await fetch_body_parts(body_parts):
             if part_data:
-                if equipment.lower() not in ["any", "all"]:
-                    part_data = [ex for ex in part_data if equipment.lower() in ex.get('equipment', '').lower()]
-                exercises.extend(part_data[:exercises_per_part])
+                exercises.extend(filter_by_equipment(part_data, eq, exercises_per_part))
     
     elif "upper body" in target_areas.lower():
         upper_parts = ["chest", "back", "shoulders", "upper arms"]
         exercises_per_part = max(1, exercises_per_round // len(upper_parts))
         
-        for body_part in upper_parts:
-            part_data = await make_api_request(f"/exercises/bodyPart/{body_part}")
+        for part_data in await fetch_body_parts(upper_parts):
             if part_data:
-                if equipment.lower() not in ["any", "all"]:
-                    part_data = [ex for ex in part_data if equipment.lower() in ex.get('equipment', '').lower()]
-                exercises.extend(part_data[:exercises_per_part])
+                exercises.extend(filter_by_equipment(part_data, eq, exercises_per_part))
     
     elif "lower body" in target_areas.lower():
         lower_parts = ["upper legs", "lower legs"]
         exercises_per_part = max(1, exercises_per_round // len(lower_parts))
         
-        for body_part in lower_parts:
-            part_data = await make_api_request(f"/exercises/bodyPart/{body_part}")
+        for part_data in await fetch_body_parts(lower_parts):
             if part_data:
-                if equipment.lower() not in ["any", "all"]:
-                    part_data = [ex for ex in part_data if equipment.lower() in ex.get('equipment', '').lower()]
-                exercises.extend(part_data[:exercises_per_part])
+                exercises.extend(filter_by_equipment(part_data, eq, exercises_per_part))
     
     elif "core" in target_areas.lower() or "abs" in target_areas.lower():
-        core_data = await make_api_request(f"/exercises/bodyPart/waist")
+        core_data = await fetch_body_part("waist")
         if core_data:
-            if equipment.lower() not in ["any", "all"]:
-                core_data = [ex for ex in core_data if equipment.lower() in ex.get('equipment', '').lower()]
-            exercises.extend(core_data[:exercises_per_round])
+            exercises.extend(filter_by_equipment(core_data, eq, exercises_per_round))
     
     elif "cardio" in target_areas.lower():
-        cardio_data = await make_api_request(f"/exercises/bodyPart/cardio")
+        cardio_data = await fetch_body_part("cardio")
         if cardio_data:
-            if equipment.lower() not in ["any", "all"]:
-                cardio_data = [ex for ex in cardio_data if equipment.lower() in ex.get('equipment', '').lower()]
-            exercises.extend(cardio_data[:exercises_per_round])
+            exercises.extend(filter_by_equipment(cardio_data, eq, exercises_per_round))
     
     # Remove duplicates and limit to desired count
-    seen_ids = set()
-    unique_exercises = []
-    for exercise in exercises:
-        if exercise.get('id') not in seen_ids:
-            seen_ids.add(exercise.get('id'))
-            unique_exercises.append(exercise)
-            if len(unique_exercises) >= exercises_per_round:
-                break
+    unique_exercises = dedupe_by_id(exercises, exercises_per_round)
     
     if not unique_exercises:
         return f"❌ Unable to create circuit workout for '{target_areas}' with '{equipment}' equipment."
     
     total_time = rounds * (exercises_per_round * work_time + (exercises_per_round - 1) * rest_time + 120)  # Include rest between rounds
     
-    circuit_plan = f"""
+    parts = [f"""
 # 🔥 {target_areas.title()} Circuit Training
 
 **⏱️ Total Duration:** ~{total_time // 60} minutes
@@ -452,10 +816,10 @@ async def create_circuit_training(
 
 ## 🎯 Circuit Structure
 
-"""
+"""]
     
     for round_num in range(1, rounds + 1):
-        circuit_plan += f"### Round {round_num}\n\n"
+        parts.append(f"### Round {round_num}\n\n")
         
         for i, exercise in enumerate(unique_exercises, 1):
             instructions = exercise.get('instructions', [])
@@ -465,32 +829,21 @@ async def create_circuit_training(
             if exercise.get('gifUrl'):
                 gif_section = f"\n- **🎬 Form Guide:** {exercise.get('gifUrl')}"
             
-            circuit_plan += f"""
+            parts.append(f"""
 **Exercise {i}: {exercise.get('name', 'Unknown Exercise')}**
-- **🎯 Target:** {exercise.get('target', 'N/A').title()}
-- **🛠️ Equipment:** {exercise.get('equipment', 'N/A').title()}
+- **🎯 Target:** {_title(exercise.get('target', 'N/A'))}
+- **🛠️ Equipment:** {_title(exercise.get('equipment', 'N/A'))}
 - **📝 Focus:** {main_instruction}
 - **⏰ Duration:** {work_time} seconds work, {rest_time} seconds rest{gif_section}
 
-"""
+""")
         
         if round_num < rounds:
-            circuit_plan += "**🔄 Rest 2 minutes before next round**\n\n"
+            parts.append("**🔄 Rest 2 minutes before next round**\n\n")
     
-    circuit_plan += """
-## 💡 Circuit Training Tips:
-- **Warm-up:** 5-10 minutes of light movement and dynamic stretching
-- **Intensity:** Maintain high intensity during work periods
-- **Form Priority:** Never sacrifice form for speed
-- **Modifications:** Adjust work/rest ratios based on fitness level
-- **Hydration:** Stay hydrated throughout the circuit
-- **Cool-down:** 5-10 minutes of stretching and breathing exercises
-
-## 🎬 Visual Demonstrations:
-Each exercise includes an animated GIF to help you maintain perfect form and maximize results.
-"""
+    parts.append(_CIRCUIT_FOOTER)
     
-    return circuit_plan
+    return "".join(parts)
 
 @mcp.tool()
 async def get_exercise_alternatives(exercise_id: str, limit: int = 5) -> str:
@@ -515,7 +868,7 @@ async def get_exercise_alternatives(exercise_id: str, limit: int = 5) -> str:
     
     if not alternatives and body_part:
         # Fallback to body part if no target alternatives
-        bodypart_data = await make_api_request(f"/exercises/bodyPart/{body_part.lower()}")
+        bodypart_data = await fetch_body_part(body_part.lower())
         if bodypart_data:
             alternatives = [ex for ex in bodypart_data if ex.get('id') != exercise_id]
     
@@ -524,7 +877,7 @@ async def get_exercise_alternatives(exercise_id: str, limit: int = 5) -> str:
     
     result = f"""
 **🔄 Alternative Exercises for: {original_exercise.get('name', 'Unknown Exercise')}**
-*(Original targets: {target_muscle.title() if target_muscle else 'N/A'} - {body_part.title() if body_part else 'N/A'})*
+*(Original targets: {_title(target_muscle) if target_muscle else 'N/A'} - {_title(body_part) if body_part else 'N/A'})*
 
 **📋 Suggested Alternatives:**
 
@@ -546,55 +899,41 @@ async def get_beginner_workout_plan(
         weeks: Number of weeks for progression (2-8)
     """
     
+    eq = equipment.lower()
+    
     # Get exercises for the focus area
     exercises = []
     
     if "full body" in focus_area.lower():
         body_parts = ["chest", "back", "upper legs", "shoulders", "upper arms", "waist"]
-        for body_part in body_parts[:4]:  # Limit to 4 body parts for beginners
-            part_data = await make_api_request(f"/exercises/bodyPart/{body_part}")
+        for part_data in await fetch_body_parts(body_parts[:4]):  # Limit to 4 body parts for beginners
             if part_data:
-                if equipment.lower() not in ["any", "all"]:
-                    part_data = [ex for ex in part_data if equipment.lower() in ex.get('equipment', '').lower()]
-                exercises.extend(part_data[:2])  # 2 exercises per body part
+                exercises.extend(filter_by_equipment(part_data, eq, 2))  # 2 exercises per body part
     
     elif "upper body" in focus_area.lower():
         upper_parts = ["chest", "back", "shoulders", "upper arms"]
-        for body_part in upper_parts:
-            part_data = await make_api_request(f"/exercises/bodyPart/{body_part}")
+        for part_data in await fetch_body_parts(upper_parts):
             if part_data:
-                if equipment.lower() not in ["any", "all"]:
-                    part_data = [ex for ex in part_data if equipment.lower() in ex.get('equipment', '').lower()]
-                exercises.extend(part_data[:2])
+                exercises.extend(filter_by_equipment(part_data, eq, 2))
     
     elif "lower body" in focus_area.lower():
         lower_parts = ["upper legs", "lower legs"]
-        for body_part in lower_parts:
-            part_data = await make_api_request(f"/exercises/bodyPart/{body_part}")
+        for part_data in await fetch_body_parts(lower_parts):
             if part_data:
-                if equipment.lower() not in ["any", "all"]:
-                    part_data = [ex for ex in part_data if equipment.lower() in ex.get('equipment', '').lower()]
-                exercises.extend(part_data[:3])
+                exercises.extend(filter_by_equipment(part_data, eq, 3))
     
     elif "core" in focus_area.lower():
-        core_data = await make_api_request(f"/exercises/bodyPart/waist")
+        core_data = await fetch_body_part("waist")
         if core_data:
-            if equipment.lower() not in ["any", "all"]:
-                core_data = [ex for ex in core_data if equipment.lower() in ex.get('equipment', '').lower()]
-            exercises.extend(core_data[:6])
+            exercises.extend(filter_by_equipment(core_data, eq, 6))
     
     # Remove duplicates
-    seen_ids = set()
-    unique_exercises = []
-    for exercise in exercises:
-        if exercise.get('id') not in seen_ids:
-            seen_ids.add(exercise.get('id'))
-            unique_exercises.append(exercise)
+    unique_exercises = dedupe_by_id(exercises)
     
     if not unique_exercises:
         return f"❌ Unable to create beginner plan for '{focus_area}' with '{equipment}' equipment."
     
-    plan = f"""
+    parts = [f"""
 # 🌟 Beginner {focus_area.title()} Workout Plan ({weeks} Weeks)
 
 **🎯 Focus:** {focus_area.title()}
@@ -617,7 +956,7 @@ async def get_beginner_workout_plan(
 
 ## 💪 Core Exercises with Visual Guides
 
-"""
+"""]
     
     for i, exercise in enumerate(unique_exercises[:8], 1):  # Limit to 8 exercises for beginners
         instructions = exercise.get('instructions', [])
@@ -627,62 +966,33 @@ async def get_beginner_workout_plan(
         if exercise.get('gifUrl'):
             gif_section = f"\n- **🎬 Form Tutorial:** {exercise.get('gifUrl')}"
         
-        plan += f"""
+        parts.append(f"""
 ### Exercise {i}: {exercise.get('name', 'Unknown Exercise')}
-- **🎯 Target:** {exercise.get('target', 'N/A').title()}
-- **🛠️ Equipment:** {exercise.get('equipment', 'N/A').title()}
+- **🎯 Target:** {_title(exercise.get('target', 'N/A'))}
+- **🛠️ Equipment:** {_title(exercise.get('equipment', 'N/A'))}
 - **📝 Beginner Focus:** {main_instruction}
 - **📊 Week 1-2:** 2 sets × 8-10 reps
 - **📊 Week 3-4:** 3 sets × 10-12 reps{gif_section}
 
-"""
+""")
     
-    plan += """
-## 🗓️ Sample Weekly Schedule
-
-**Monday:** Full routine
-**Tuesday:** Rest or light walking
-**Wednesday:** Full routine
-**Thursday:** Rest or light stretching
-**Friday:** Full routine
-**Saturday:** Rest or light activity
-**Sunday:** Rest
-
-## 🌟 Beginner Success Tips
-
-1. **Start Slow:** Master the movement before adding intensity
-2. **Listen to Your Body:** Some muscle soreness is normal, sharp pain is not
-3. **Consistency Over Intensity:** Regular moderate workouts beat sporadic intense ones
-4. **Use the GIFs:** Study the visual demonstrations before each exercise
-5. **Progress Gradually:** Add weight/reps only when current level feels easy
-6. **Rest is Important:** Allow 48 hours between training the same muscle groups
-7. **Stay Hydrated:** Drink water before, during, and after workouts
-8. **Track Progress:** Keep a simple log of sets, reps, and how you feel
-
-## 🎬 Visual Learning
-Each exercise includes an animated GIF demonstration. Study these carefully to:
-- Learn proper form and technique
-- Understand the full range of motion
-- See the exercise pace and rhythm
-- Identify common mistakes to avoid
-"""
+    parts.append(_BEGINNER_FOOTER)
     
-    return plan
+    return "".join(parts)
 
 @mcp.tool()
 async def search_exercises_by_name(name: str, limit: int = 10) -> str:
     """Search for exercises by name with GIF demonstrations. Returns exercises that match the search term."""
-    endpoint = "/exercises"
-    data = await make_api_request(endpoint)
+    name_index = await get_exercise_name_index()
     
-    if not data:
+    if not name_index:
         return "❌ Unable to search exercises. Please check your connection."
     
     # Filter exercises by name (case-insensitive)
     search_term = name.lower()
     filtered_exercises = [
-        exercise for exercise in data 
-        if search_term in exercise.get('name', '').lower()
+        exercise for lowered_name, exercise in name_index
+        if search_term in lowered_name
     ]
     
     if not filtered_exercises:
@@ -706,133 +1016,85 @@ async def get_workout_by_difficulty(
         duration: Workout duration in minutes
     """
     
+    eq = equipment.lower()
+    focus = body_focus.lower()
+    
+    # Reject unknown body parts and equipment before fanning out; skip a check if its list is unavailable
+    valid_parts, valid_equipment = await asyncio.gather(
+        make_api_request("/exercises/bodyPartList"),
+        make_api_request("/exercises/equipmentList")
+    )
+    if valid_parts and "full body" not in focus and focus not in valid_parts:
+        return f"❌ Unknown body focus: {body_focus}. Use get_body_parts_list() to see options."
+    if valid_equipment and eq not in _ANY_EQUIPMENT and not any(eq in value.lower() for value in valid_equipment):
+        return f"❌ Unknown equipment: {equipment}. Use get_equipment_list() to see options."
+    
+    difficulty_title = difficulty.title()
+    focus_title = body_focus.title()
+    equipment_title = equipment.title()
+    
     # Adjust exercise count and intensity based on difficulty
-    if difficulty.lower() == "beginner":
-        exercise_count = 5
-        sets_info = "2-3 sets of 8-12 reps"
-        rest_info = "90-120 seconds"
-        intensity_note = "Focus on learning proper form. Start with bodyweight or light weights."
-    elif difficulty.lower() == "intermediate":
-        exercise_count = 7
-        sets_info = "3-4 sets of 10-15 reps"
-        rest_info = "60-90 seconds"
-        intensity_note = "Moderate intensity. Challenge yourself while maintaining good form."
-    else:  # advanced
-        exercise_count = 9
-        sets_info = "4-5 sets of 12-20 reps"
-        rest_info = "45-75 seconds"
-        intensity_note = "High intensity. Push your limits with perfect form and controlled movements."
+    exercise_count, sets_info, rest_info, intensity_note = _DIFFICULTY_PROFILE.get(difficulty.lower(), _DIFFICULTY_PROFILE["advanced"])
     
     # Get exercises based on body focus
     exercises = []
     
-    if "full body" in body_focus.lower():
+    if "full body" in focus:
         body_parts = ["chest", "back", "upper legs", "shoulders", "upper arms", "waist"]
         exercises_per_part = max(1, exercise_count // len(body_parts))
         
-        for body_part in body_parts:
-            part_data = await make_api_request(f"/exercises/bodyPart/{body_part}")
+        for part_data in await fetch_body_parts(body_parts):
             if part_data:
-                if equipment.lower() not in ["any", "all"]:
-                    part_data = [ex for ex in part_data if equipment.lower() in ex.get('equipment', '').lower()]
-                exercises.extend(part_data[:exercises_per_part])
+                exercises.extend(filter_by_equipment(part_data, eq, exercises_per_part))
     else:
         # Single body part focus
-        part_data = await make_api_request(f"/exercises/bodyPart/{body_focus.lower()}")
+        part_data = await fetch_body_part(focus)
         if part_data:
-            if equipment.lower() not in ["any", "all"]:
-                part_data = [ex for ex in part_data if equipment.lower() in ex.get('equipment', '').lower()]
-            exercises.extend(part_data[:exercise_count])
+            exercises.extend(filter_by_equipment(part_data, eq, exercise_count))
     
     # Remove duplicates and limit
-    seen_ids = set()
-    unique_exercises = []
-    for exercise in exercises:
-        if exercise.get('id') not in seen_ids:
-            seen_ids.add(exercise.get('id'))
-            unique_exercises.append(exercise)
-            if len(unique_exercises) >= exercise_count:
-                break
+    unique_exercises = dedupe_by_id(exercises, exercise_count)
     
     if not unique_exercises:
         return f"❌ Unable to create {difficulty} workout for '{body_focus}' with '{equipment}' equipment."
     
-    workout_plan = f"""
-# 🎯 {difficulty.title()} {body_focus.title()} Workout
-
-**📊 Difficulty Level:** {difficulty.title()}
-**🎯 Focus Area:** {body_focus.title()}
-**🛠️ Equipment:** {equipment.title()}
-**⏱️ Duration:** ~{duration} minutes
-**💪 Exercises:** {len(unique_exercises)}
-
-## 📋 {difficulty.title()} Guidelines
-- **Sets/Reps:** {sets_info}
-- **Rest Between Sets:** {rest_info}
-- **Intensity:** {intensity_note}
-
-## 💪 Workout Exercises
-
-"""
+    parts = [_WORKOUT_HEADER_TMPL.format_map({
+        "difficulty_title": difficulty_title,
+        "focus_title": focus_title,
+        "equipment_title": equipment_title,
+        "duration": duration,
+        "exercise_count": len(unique_exercises),
+        "sets_info": sets_info,
+        "rest_info": rest_info,
+        "intensity_note": intensity_note,
+    })]
     
     for i, exercise in enumerate(unique_exercises, 1):
-        instructions = exercise.get('instructions', [])
+        name = exercise.get('name', 'Unknown Exercise')
+        target = _title(exercise.get('target', 'N/A'))
+        equip = _title(exercise.get('equipment', 'N/A'))
+        gif = exercise.get('gifUrl')
+        instructions = exercise.get('instructions')
         main_instruction = instructions[0] if instructions else "Maintain proper form throughout"
+        gif_section = f"\n- **🎬 Technique Guide:** {gif}" if gif else ""
         
-        gif_section = ""
-        if exercise.get('gifUrl'):
-            gif_section = f"\n- **🎬 Technique Guide:** {exercise.get('gifUrl')}"
-        
-        workout_plan += f"""
-### Exercise {i}: {exercise.get('name', 'Unknown Exercise')}
-- **🎯 Target:** {exercise.get('target', 'N/A').title()}
-- **🛠️ Equipment:** {exercise.get('equipment', 'N/A').title()}
+        parts.append(f"""
+### Exercise {i}: {name}
+- **🎯 Target:** {target}
+- **🛠️ Equipment:** {equip}
 - **📝 Key Points:** {main_instruction}
-- **📊 {difficulty.title()} Protocol:** {sets_info}
+- **📊 {difficulty_title} Protocol:** {sets_info}
 - **⏰ Rest:** {rest_info}{gif_section}
 
-"""
+""")
     
     # Add difficulty-specific tips
-    if difficulty.lower() == "beginner":
-        tips_section = """
-## 🌟 Beginner Tips
-- Study the GIF demonstrations before starting each exercise
-- Start with lighter weights or easier variations
-- Focus on learning the movement pattern first
-- Don't rush - quality over quantity
-- It's okay to take longer rest periods initially
-"""
-    elif difficulty.lower() == "intermediate":
-        tips_section = """
-## 🔥 Intermediate Progression
-- Use the GIFs to refine your technique
-- Gradually increase weight when you can complete all sets easily
-- Focus on mind-muscle connection
-- Consider adding drop sets or supersets for extra challenge
-- Track your progress to ensure continuous improvement
-"""
-    else:
-        tips_section = """
-## ⚡ Advanced Techniques
-- Use the GIFs to perfect your form even at high intensities
-- Implement advanced techniques like rest-pause, drop sets, or tempo work
-- Focus on progressive overload and periodization
-- Consider adding plyometric or explosive movements
-- Push intensity while never compromising form
-"""
+    tips_section = _DIFFICULTY_TIPS.get(difficulty.lower(), _DIFFICULTY_TIPS["advanced"])
     
-    workout_plan += tips_section + """
-
-## 🎬 Visual Form Guides
-Every exercise includes an animated demonstration to help you:
-- Master proper technique at your skill level
-- Understand the optimal range of motion
-- Maintain consistent form throughout your sets
-- Progress safely to more advanced variations
-"""
+    parts.append(tips_section)
+    parts.append(_DIFFICULTY_FOOTER)
     
-    return workout_plan
+    return "".join(parts)
 
 @mcp.tool()
 async def get_body_parts_list() -> str:
@@ -841,9 +1103,9 @@ async def get_body_parts_list() -> str:
     data = await make_api_request(endpoint)
     
     if not data:
-        return "❌ Unable to fetch body parts list."
+        return _ERR_BODY_PARTS
     
-    return "**📍 Available Body Parts for Exercise Filtering:**\n\n" + "\n".join([f"• {part.title()}" for part in data])
+    return "**📍 Available Body Parts for Exercise Filtering:**\n\n" + "\n".join([f"• {_title(part)}" for part in data])
 
 @mcp.tool()
 async def get_target_muscles_list() -> str:
@@ -852,9 +1114,9 @@ async def get_target_muscles_list() -> str:
     data = await make_api_request(endpoint)
     
     if not data:
-        return "❌ Unable to fetch target muscles list."
+        return _ERR_TARGETS
     
-    return "**🎯 Available Target Muscles for Exercise Filtering:**\n\n" + "\n".join([f"• {muscle.title()}" for muscle in data])
+    return "**🎯 Available Target Muscles for Exercise Filtering:**\n\n" + "\n".join([f"• {_title(muscle)}" for muscle in data])
 
 @mcp.tool()
 async def get_equipment_list() -> str:
@@ -863,9 +1125,32 @@ async def get_equipment_list() -> str:
     data = await make_api_request(endpoint)
     
     if not data:
-        return "❌ Unable to fetch equipment list."
+        return _ERR_EQUIPMENT
     
-    return "**🛠️ Available Equipment for Exercise Filtering:**\n\n" + "\n".join([f"• {equipment.title()}" for equipment in data])
+    return "**🛠️ Available Equipment for Exercise Filtering:**\n\n" + "\n".join([f"• {_title(equipment)}" for equipment in data])
+
+@mcp.tool()
+async def get_all_filter_lists() -> str:
+    """Get all available body parts, target muscles and equipment types in one call."""
+    body_parts, target_muscles, equipment_types = await asyncio.gather(
+        make_api_request("/exercises/bodyPartList"),
+        make_api_request("/exercises/targetList"),
+        make_api_request("/exercises/equipmentList")
+    )
+    
+    if not (body_parts or target_muscles or equipment_types):
+        return _ERR_FILTER_LISTS
+    
+    sections = []
+    for heading, values in [
+        ("**📍 Body Parts:**", body_parts),
+        ("**🎯 Target Muscles:**", target_muscles),
+        ("**🛠️ Equipment:**", equipment_types)
+    ]:
+        listing = "\n".join([f"• {_title(value)}" for value in values]) if values else "Unavailable right now."
+        sections.append(f"{heading}\n{listing}")
+    
+    return "**🔎 Available Exercise Filters:**\n\n" + "\n\n".join(sections)
 
 @mcp.tool()
 async def create_hiit_workout(
@@ -885,124 +1170,78 @@ async def create_hiit_workout(
         rest_time: Rest period in seconds
     """
     
-    # Get cardio and high-intensity exercises
-    cardio_exercises = await make_api_request("/exercises/bodyPart/cardio")
-    compound_exercises = []
+    eq = equipment.lower()
+    intensity_title = intensity.title()
+    equipment_title = equipment.title()
     
-    # Get compound exercises from major muscle groups
+    # Get cardio and high-intensity exercises alongside compound exercises from major muscle groups
     body_parts = ["chest", "back", "upper legs", "shoulders"]
-    for body_part in body_parts:
-        part_data = await make_api_request(f"/exercises/bodyPart/{body_part}")
+    cardio_exercises, *compound_results = await fetch_body_parts(["cardio"] + body_parts)
+    compound_exercises = []
+    
+    for part_data in compound_results:
         if part_data:
-            if equipment.lower() not in ["any", "all"]:
-                part_data = [ex for ex in part_data if equipment.lower() in ex.get('equipment', '').lower()]
-            compound_exercises.extend(part_data[:2])
+            compound_exercises.extend(filter_by_equipment(part_data, eq, 2))
     
     # Combine exercises
     all_exercises = []
     if cardio_exercises:
-        if equipment.lower() not in ["any", "all"]:
-            cardio_exercises = [ex for ex in cardio_exercises if equipment.lower() in ex.get('equipment', '').lower()]
-        all_exercises.extend(cardio_exercises[:3])
+        all_exercises.extend(filter_by_equipment(cardio_exercises, eq, 3))
     
     all_exercises.extend(compound_exercises)
     
     # Remove duplicates
-    seen_ids = set()
-    unique_exercises = []
-    for exercise in all_exercises:
-        if exercise.get('id') not in seen_ids:
-            seen_ids.add(exercise.get('id'))
-            unique_exercises.append(exercise)
-            if len(unique_exercises) >= 6:  # Limit for HIIT
-                break
+    unique_exercises = dedupe_by_id(all_exercises, 6)  # Limit for HIIT
     
     if not unique_exercises:
         return f"❌ Unable to create HIIT workout with '{equipment}' equipment."
     
     total_time = rounds * (len(unique_exercises) * (work_time + rest_time))
     
-    hiit_plan = f"""
-# 🔥 HIIT Workout - {intensity.title()} Intensity
-
-**⚡ Intensity Level:** {intensity.title()}
-**🛠️ Equipment:** {equipment.title()}
-**🔄 Rounds:** {rounds}
-**💪 Exercises:** {len(unique_exercises)}
-**⏰ Work Time:** {work_time} seconds
-**😴 Rest Time:** {rest_time} seconds
-**⏱️ Total Time:** ~{total_time // 60} minutes
-
-## 🎯 HIIT Structure
-
-Perform each exercise for {work_time} seconds, rest for {rest_time} seconds, then move to the next exercise. Complete all exercises for one round, then repeat for {rounds} total rounds.
-
-"""
-    
-    for round_num in range(1, rounds + 1):
-        hiit_plan += f"### Round {round_num}\n\n"
+    parts = [_HIIT_HEADER_TMPL.format_map({
+        "intensity_title": intensity_title,
+        "equipment_title": equipment_title,
+        "rounds": rounds,
+        "exercise_count": len(unique_exercises),
+        "work_time": work_time,
+        "rest_time": rest_time,
+        "total_minutes": total_time // 60,
+    })]
+    
+    # Every round repeats the same exercises, so render them once
+    round_body_parts = []
+    for i, exercise in enumerate(unique_exercises, 1):
+        name = exercise.get('name', 'Unknown Exercise')
+        target = _title(exercise.get('target', 'N/A'))
+        equip = _title(exercise.get('equipment', 'N/A'))
+        gif = exercise.get('gifUrl')
+        instructions = exercise.get('instructions')
+        main_instruction = instructions[0] if instructions else "Maintain high intensity"
+        gif_section = f"\n- **🎬 Form Demo:** {gif}" if gif else ""
         
-        for i, exercise in enumerate(unique_exercises, 1):
-            instructions = exercise.get('instructions', [])
-            main_instruction = instructions[0] if instructions else "Maintain high intensity"
-            
-            gif_section = ""
-            if exercise.get('gifUrl'):
-                gif_section = f"\n- **🎬 Form Demo:** {exercise.get('gifUrl')}"
-            
-            hiit_plan += f"""
-**Exercise {i}: {exercise.get('name', 'Unknown Exercise')}**
-- **🎯 Target:** {exercise.get('target', 'N/A').title()}
-- **🛠️ Equipment:** {exercise.get('equipment', 'N/A').title()}
+        round_body_parts.append(f"""
+**Exercise {i}: {name}**
+- **🎯 Target:** {target}
+- **🛠️ Equipment:** {equip}
 - **📝 HIIT Focus:** {main_instruction}
 - **⏰ Duration:** {work_time}s work → {rest_time}s rest{gif_section}
 
-"""
+""")
+    round_body = "".join(round_body_parts)
+    
+    for round_num in range(1, rounds + 1):
+        parts.append(f"### Round {round_num}\n\n{round_body}")
         
         if round_num < rounds:
-            hiit_plan += "**🔄 Complete rest, then start next round**\n\n"
+            parts.append("**🔄 Complete rest, then start next round**\n\n")
     
     # Intensity-specific guidelines
-    if intensity.lower() == "low":
-        intensity_guide = """
-## 🌱 Low Intensity Guidelines
-- Work at 60-70% of maximum effort
-- Focus on maintaining good form throughout
-- This is great for beginners or recovery days
-- You should be able to maintain a conversation during rest periods
-"""
-    elif intensity.lower() == "moderate":
-        intensity_guide = """
-## 🔥 Moderate Intensity Guidelines
-- Work at 70-85% of maximum effort
-- Push yourself but maintain control
-- You should feel challenged but not completely exhausted
-- Brief conversations possible during rest periods
-"""
-    else:
-        intensity_guide = """
-## ⚡ High Intensity Guidelines
-- Work at 85-95% of maximum effort
-- Give everything you have during work periods
-- You should feel significantly challenged
-- Focus on recovery during rest periods - minimal talking
-"""
+    intensity_guide = _INTENSITY_GUIDE.get(intensity.lower(), _INTENSITY_GUIDE["high"])
     
-    hiit_plan += intensity_guide + """
-
-## 💡 HIIT Success Tips
-- **Warm-up:** 5-10 minutes of light cardio and dynamic stretching
-- **Form First:** Never sacrifice form for speed, even in HIIT
-- **Use the GIFs:** Study proper technique before starting
-- **Listen to Your Body:** Adjust intensity based on how you feel
-- **Stay Hydrated:** Keep water nearby throughout the workout
-- **Cool-down:** 5-10 minutes of walking and stretching
-
-## 🎬 Visual Technique Guides
-Each exercise includes animated demonstrations to help you maintain proper form even at high intensity.
-"""
+    parts.append(intensity_guide)
+    parts.append(_HIIT_FOOTER)
     
-    return hiit_plan
+    return "".join(parts)
 
 @mcp.tool()
 async def get_exercise_modifications(exercise_id: str) -> str:
@@ -1024,70 +1263,76 @@ async def get_exercise_modifications(exercise_id: str) -> str:
         if target_data:
             related_exercises = [ex for ex in target_data if ex.get('id') != exercise_id]
     
-    # Separate by equipment complexity for easier/harder suggestions
-    bodyweight_exercises = [ex for ex in related_exercises if 'body weight' in ex.get('equipment', '').lower()]
-    equipment_exercises = [ex for ex in related_exercises if 'body weight' not in ex.get('equipment', '').lower()]
+    # Separate by equipment complexity for easier/harder suggestions, stopping once both have enough to show
+    bodyweight_exercises = []
+    equipment_exercises = []
+    for ex in related_exercises:
+        if 'body weight' in ex['_equipment_lc']:
+            bodyweight_exercises.append(ex)
+        else:
+            equipment_exercises.append(ex)
+        if len(bodyweight_exercises) >= 3 and len(equipment_exercises) >= 3:
+            break
     
-    result = f"""
+    parts = [f"""
 **🔧 Exercise Modifications for: {original_exercise.get('name', 'Unknown Exercise')}**
 
 **📋 Original Exercise Details:**
-- **Target:** {target_muscle.title() if target_muscle else 'N/A'}
-- **Equipment:** {equipment.title() if equipment else 'N/A'}
+- **Target:** {_title(target_muscle) if target_muscle else 'N/A'}
+- **Equipment:** {_title(equipment) if equipment else 'N/A'}
 - **🎬 Original Demo:** {original_exercise.get('gifUrl', 'N/A')}
 
 ## 🌱 Easier Modifications (Beginner-Friendly)
 
-"""
+"""]
     
     # Show easier alternatives (typically bodyweight)
     if bodyweight_exercises:
         easier_exercises = bodyweight_exercises[:3]
         for i, exercise in enumerate(easier_exercises, 1):
-            gif_section = ""
-            if exercise.get('gifUrl'):
-                gif_section = f"\n- **🎬 Demo:** {exercise.get('gifUrl')}"
+            name = exercise.get('name', 'Unknown Exercise')
+            equip = _title(exercise.get('equipment', 'N/A'))
+            gif = exercise.get('gifUrl')
+            instructions = exercise.get('instructions')
+            main_instruction = instructions[0][:100] if instructions else "Focus on proper form"
+            gif_section = f"\n- **🎬 Demo:** {gif}" if gif else ""
             
-            result += f"""
-**{i}. {exercise.get('name', 'Unknown Exercise')}**
-- **Equipment:** {exercise.get('equipment', 'N/A').title()}
+            parts.append(f"""
+**{i}. {name}**
+- **Equipment:** {equip}
 - **Why Easier:** Requires less equipment and resistance
-- **Instructions:** {exercise.get('instructions', ['No instructions available'])[0][:100] if exercise.get('instructions') else 'Focus on proper form'}{gif_section}
+- **Instructions:** {main_instruction}{gif_section}
 
-"""
+""")
     else:
-        result += "No easier bodyweight alternatives found for this exercise.\n\n"
+        parts.append("No easier bodyweight alternatives found for this exercise.\n\n")
     
-    result += "## ⚡ Harder Modifications (Advanced Challenges)\n\n"
+    parts.append("## ⚡ Harder Modifications (Advanced Challenges)\n\n")
     
     # Show harder alternatives (typically with equipment)
     if equipment_exercises:
         harder_exercises = equipment_exercises[:3]
         for i, exercise in enumerate(harder_exercises, 1):
-            gif_section = ""
-            if exercise.get('gifUrl'):
-                gif_section = f"\n- **🎬 Demo:** {exercise.get('gifUrl')}"
+            name = exercise.get('name', 'Unknown Exercise')
+            equip = _title(exercise.get('equipment', 'N/A'))
+            gif = exercise.get('gifUrl')
+            instructions = exercise.get('instructions')
+            main_instruction = instructions[0][:100] if instructions else "Focus on controlled movement"
+            gif_section = f"\n- **🎬 Demo:** {gif}" if gif else ""
             
-            result += f"""
-**{i}. {exercise.get('name', 'Unknown Exercise')}**
-- **Equipment:** {exercise.get('equipment', 'N/A').title()}
+            parts.append(f"""
+**{i}. {name}**
+- **Equipment:** {equip}
 - **Why Harder:** Requires additional equipment or resistance
-- **Instructions:** {exercise.get('instructions', ['No instructions available'])[0][:100] if exercise.get('instructions') else 'Focus on controlled movement'}{gif_section}
+- **Instructions:** {main_instruction}{gif_section}
 
-"""
+""")
     else:
-        result += "No harder equipment-based alternatives found.\n\n"
+        parts.append("No harder equipment-based alternatives found.\n\n")
     
-    result += """
-## 💡 Modification Tips
-- **Progression:** Start with easier versions and gradually work up
-- **Listen to Your Body:** Choose modifications based on your current ability
-- **Form Priority:** Perfect easier versions before attempting harder ones
-- **Use GIFs:** Study the demonstrations to understand proper technique
-- **Consistency:** Regular practice with appropriate modifications beats sporadic advanced attempts
-"""
+    parts.append(_MODIFICATION_FOOTER)
     
-    return result
+    return "".join(parts)
 
 if __name__ == "__main__":
     # Initialize and run the server